@@ -196,7 +196,11 @@ class VectorStore:
             else:
                 self.chroma_collection = self.chroma_client.create_collection(
                     name=self.settings.chromadb_collection_name,
-                    metadata={"description": "ARGO oceanographic data knowledge base"}
+                    metadata={
+                        "description": "ARGO oceanographic data knowledge base",
+                        # Rank by angle rather than magnitude, since embeddings are not normalized
+                        "hnsw:space": "cosine",
+                    }
                 )
                 logger.info("Created new ChromaDB collection")
             
@@ -43,6 +43,18 @@ class RealGeminiService:
             self.available = False
             logger.warning("Gemini API key not configured, using fallback responses")
         
+        # Request options are fixed for the service lifetime, so build them once
+        self.safety_settings = {
+            HarmCategory.HARM_CATEGORY_HATE_SPEECH: HarmBlockThreshold.BLOCK_MEDIUM_AND_ABOVE,
+            HarmCategory.HARM_CATEGORY_DANGEROUS_CONTENT: HarmBlockThreshold.BLOCK_MEDIUM_AND_ABOVE,
+            HarmCategory.HARM_CATEGORY_SEXUALLY_EXPLICIT: HarmBlockThreshold.BLOCK_MEDIUM_AND_ABOVE,
+            HarmCategory.HARM_CATEGORY_HARASSMENT: HarmBlockThreshold.BLOCK_MEDIUM_AND_ABOVE,
+        }
+        self.generation_config = genai.types.GenerationConfig(
+            temperature=self.temperature,
+            max_output_tokens=self.max_tokens,
+        )
+        
         # Ocean data analysis prompts
         self.system_prompt = """You are FloatChat, an expert AI assistant specialized in ARGO oceanographic data analysis. 
 
@@ -284,23 +296,12 @@ Respond in a conversational but informative tone."""
     async def _generate_response(self, prompt: str) -> str:
         """Generate response using Gemini API."""
         try:
-            # Configure safety settings
-            safety_settings = {
-                HarmCategory.HARM_CATEGORY_HATE_SPEECH: HarmBlockThreshold.BLOCK_MEDIUM_AND_ABOVE,
-                HarmCategory.HARM_CATEGORY_DANGEROUS_CONTENT: HarmBlockThreshold.BLOCK_MEDIUM_AND_ABOVE,
-                HarmCategory.HARM_CATEGORY_SEXUALLY_EXPLICIT: HarmBlockThreshold.BLOCK_MEDIUM_AND_ABOVE,
-                HarmCategory.HARM_CATEGORY_HARASSMENT: HarmBlockThreshold.BLOCK_MEDIUM_AND_ABOVE,
-            }
-            
             # Generate content
             response = await asyncio.to_thread(
                 self.model.generate_content,
                 prompt,
-                safety_settings=safety_settings,
-                generation_config=genai.types.GenerationConfig(
-                    temperature=self.temperature,
-                    max_output_tokens=self.max_tokens,
-                )
+                safety_settings=self.safety_settings,
+                generation_config=self.generation_config
             )
             
             if response.candidates:
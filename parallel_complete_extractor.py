@@ -31,6 +31,12 @@ import structlog
 import xarray as xr
 from multiprocessing import Pool, cpu_count
 
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
 
 logger = structlog.get_logger(__name__)
 
@@ -75,6 +81,64 @@ def _decode_str_array(value: Any) -> str:
     return str(value).strip()
 
 
+def _as_level_grid(values: Any, n_prof: int, n_levels: int) -> np.ndarray:
+    """Return a variable as a contiguous float64 (n_prof, n_levels) grid, NaN where absent.
+
+    1-D variables are shared by every profile, matching PRES[lvl] indexing.
+    """
+    grid = np.full((n_prof, n_levels), np.nan)
+    if values is None:
+        return grid
+    try:
+        arr = np.asarray(values, dtype=np.float64)
+    except (TypeError, ValueError):
+        return grid
+    if arr.ndim == 2:
+        rows, cols = min(n_prof, arr.shape[0]), min(n_levels, arr.shape[1])
+        grid[:rows, :cols] = arr[:rows, :cols]
+    elif arr.ndim == 1:
+        cols = min(n_levels, arr.shape[0])
+        grid[:, :cols] = arr[:cols]
+    return grid
+
+
+def _qc_levels_loop(pres: np.ndarray, temp: np.ndarray, psal: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Blank out-of-range levels with NaN: pressure >= 0, -5..50 °C temperature, 0..50 PSU salinity.
+
+    Comparisons against NaN are False, so missing values stay NaN without an isnan check.
+    """
+    n_prof, n_levels = pres.shape
+    out_pres = np.full((n_prof, n_levels), np.nan)
+    out_temp = np.full((n_prof, n_levels), np.nan)
+    out_psal = np.full((n_prof, n_levels), np.nan)
+    for p in range(n_prof):
+        for lvl in range(n_levels):
+            pr = pres[p, lvl]
+            if pr >= 0:
+                out_pres[p, lvl] = pr
+            tm = temp[p, lvl]
+            if -5 <= tm <= 50:
+                out_temp[p, lvl] = tm
+            sa = psal[p, lvl]
+            if 0 <= sa <= 50:
+                out_psal[p, lvl] = sa
+    return out_pres, out_temp, out_psal
+
+
+def _qc_levels_vectorized(pres: np.ndarray, temp: np.ndarray, psal: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """NumPy equivalent of _qc_levels_loop, used when Numba is not installed."""
+    with np.errstate(invalid="ignore"):
+        return (
+            np.where(pres >= 0, pres, np.nan),
+            np.where((temp >= -5) & (temp <= 50), temp, np.nan),
+            np.where((psal >= 0) & (psal <= 50), psal, np.nan),
+        )
+
+
+# Compiled machine code is cached on disk, so only the first run pays for compilation
+_qc_levels = njit(cache=True)(_qc_levels_loop) if NUMBA_AVAILABLE else _qc_levels_vectorized
+
+
 def extract_file(file_path: str) -> Dict[str, Any]:
     """Extract float, profile and measurement data from a NetCDF file.
 
@@ -169,53 +233,33 @@ def extract_file(file_path: str) -> Dict[str, Any]:
                 }
             )
 
-            # Measurements per profile
-            for lvl in range(n_levels):
-                pr = None
-                tm = None
-                sa = None
-                depth = None
-                try:
-                    if PRES is not None:
-                        pr = float(PRES[p, lvl] if PRES.ndim == 2 else PRES[lvl])
-                        if np.isnan(pr) or pr < 0:
-                            pr = None
-                        else:
-                            depth = pr
-                except Exception:
-                    pr = None
-
-                try:
-                    if TEMP is not None:
-                        tm = float(TEMP[p, lvl] if TEMP.ndim == 2 else TEMP[lvl])
-                        if np.isnan(tm) or not (-5 <= tm <= 50):
-                            tm = None
-                except Exception:
-                    tm = None
-
-                try:
-                    if PSAL is not None:
-                        sa = float(PSAL[p, lvl] if PSAL.ndim == 2 else PSAL[lvl])
-                        if np.isnan(sa) or not (0 <= sa <= 50):
-                            sa = None
-                except Exception:
-                    sa = None
-
-                if pr is None and tm is None and sa is None:
-                    continue
-
-                measurements.append(
-                    (
-                        p + 1,  # profile_number ref
-                        pr,
-                        depth,
-                        tm,
-                        sa,
-                        "1",
-                        "1",
-                        "1",
-                    )
+        # Measurements: range-check every level at once, keep levels with any valid value
+        pres_ok, temp_ok, psal_ok = _qc_levels(
+            _as_level_grid(PRES, n_prof, n_levels),
+            _as_level_grid(TEMP, n_prof, n_levels),
+            _as_level_grid(PSAL, n_prof, n_levels),
+        )
+        keep = ~(np.isnan(pres_ok) & np.isnan(temp_ok) & np.isnan(psal_ok))
+        prof_idx, _ = np.nonzero(keep)
+        for prof_num, pr, tm, sa in zip(
+            (prof_idx + 1).tolist(),
+            pres_ok[keep].tolist(),
+            temp_ok[keep].tolist(),
+            psal_ok[keep].tolist(),
+        ):
+            pr = None if pr != pr else pr
+            measurements.append(
+                (
+                    prof_num,  # profile_number ref
+                    pr,
+                    pr,  # depth
+                    None if tm != tm else tm,
+                    None if sa != sa else sa,
+                    "1",
+                    "1",
+                    "1",
                 )
+            )
 
         return {
             "file": os.path.basename(file_path),
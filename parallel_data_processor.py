@@ -4,12 +4,14 @@ PARALLEL ARGO Data Processor - Ultra-fast processing with multiprocessing.
 
 Optimizations:
 - Multiprocessing for parallel NetCDF file processing
-- Batch database operations (bulk insert)
+- Batch database operations (COPY into staging + single upsert)
 - Memory-efficient streaming
 - Progress tracking with real-time updates
 - Chunked processing to avoid memory issues
 """
 
+import csv
+import io
 import sys
 from pathlib import Path
 sys.path.append(str(Path(__file__).parent))
@@ -21,7 +23,7 @@ from sqlalchemy.orm import sessionmaker
 from datetime import datetime, timedelta
 import logging
 import multiprocessing as mp
-from concurrent.futures import ProcessPoolExecutor, as_completed
+from concurrent.futures import ProcessPoolExecutor
 import time
 from typing import List, Dict, Any, Optional
 import queue
@@ -39,6 +41,37 @@ logger = logging.getLogger(__name__)
 
 settings = get_settings()
 
+# Columns shared by the COPY staging table and argo_floats
+FLOAT_COLUMNS = "wmo_id, platform_type, deployment_latitude, deployment_longitude, deployment_date, status"
+
+CREATE_STAGING_SQL = """
+CREATE TEMP TABLE IF NOT EXISTS argo_floats_staging (
+    wmo_id BIGINT,
+    platform_type TEXT,
+    deployment_latitude DOUBLE PRECISION,
+    deployment_longitude DOUBLE PRECISION,
+    deployment_date TIMESTAMP,
+    status TEXT
+) ON COMMIT DELETE ROWS
+"""
+
+COPY_STAGING_SQL = f"COPY argo_floats_staging ({FLOAT_COLUMNS}) FROM STDIN WITH (FORMAT csv)"
+
+# DISTINCT ON keeps one row per float so ON CONFLICT never touches a row twice;
+# among in-batch duplicates it keeps the latest dated row with real coordinates
+UPSERT_FROM_STAGING_SQL = f"""
+INSERT INTO argo_floats ({FLOAT_COLUMNS})
+SELECT DISTINCT ON (wmo_id) {FLOAT_COLUMNS}
+FROM argo_floats_staging
+ORDER BY wmo_id,
+    deployment_date DESC NULLS LAST,
+    (deployment_latitude <> 0 OR deployment_longitude <> 0) DESC NULLS LAST
+ON CONFLICT (wmo_id) DO UPDATE SET
+    deployment_latitude = EXCLUDED.deployment_latitude,
+    deployment_longitude = EXCLUDED.deployment_longitude,
+    deployment_date = COALESCE(EXCLUDED.deployment_date, argo_floats.deployment_date)
+"""
+
 def process_single_netcdf(file_path: str) -> Optional[Dict[str, Any]]:
     """
     Process a single NetCDF file - optimized for parallel execution.
@@ -188,37 +221,36 @@ class ParallelArgoProcessor:
         logger.info(f"Initialized parallel processor with {self.max_workers} workers")
     
     def bulk_insert_floats(self, float_records: List[Dict[str, Any]]) -> bool:
-        """Efficiently bulk insert float records using raw SQL."""
+        """Efficiently bulk upsert float records via COPY into a staging table."""
         if not float_records:
             return True
             
         try:
-            # Prepare bulk insert data
-            values = []
+            # Stream the batch as CSV; an empty unquoted field loads as NULL
+            buffer = io.StringIO()
+            writer = csv.writer(buffer)
             for record in float_records:
-                wmo_id = record['wmo_id']
-                platform_type = record.get('platform_type', 'ARGO_FLOAT')
-                lat = record.get('deployment_latitude', 0.0)
-                lon = record.get('deployment_longitude', 0.0)
                 date = record.get('deployment_date')
-                status = record.get('status', 'ACTIVE')
-                
-                date_str = f"'{date.isoformat()}'" if date else 'NULL'
-                values.append(f"({wmo_id}, '{platform_type}', {lat}, {lon}, {date_str}, '{status}')")
-            
-            # Bulk insert with ON CONFLICT handling
-            sql = f"""
-            INSERT INTO argo_floats (wmo_id, platform_type, deployment_latitude, deployment_longitude, deployment_date, status)
-            VALUES {','.join(values)}
-            ON CONFLICT (wmo_id) DO UPDATE SET
-                deployment_latitude = EXCLUDED.deployment_latitude,
-                deployment_longitude = EXCLUDED.deployment_longitude,
-                deployment_date = COALESCE(EXCLUDED.deployment_date, argo_floats.deployment_date)
-            """
+                writer.writerow((
+                    record['wmo_id'],
+                    record.get('platform_type', 'ARGO_FLOAT'),
+                    record.get('deployment_latitude', 0.0),
+                    record.get('deployment_longitude', 0.0),
+                    date.isoformat() if date else '',
+                    record.get('status', 'ACTIVE')
+                ))
+            buffer.seek(0)
             
-            with self.engine.connect() as conn:
-                conn.execute(text(sql))
-                conn.commit()
+            # COPY the batch in, then upsert it with one statement in the same transaction
+            connection = self.engine.raw_connection()
+            try:
+                with connection.cursor() as cursor:
+                    cursor.execute(CREATE_STAGING_SQL)
+                    cursor.copy_expert(COPY_STAGING_SQL, buffer)
+                    cursor.execute(UPSERT_FROM_STAGING_SQL)
+                connection.commit()
+            finally:
+                connection.close()
             
             return True
             
@@ -226,7 +258,7 @@ class ParallelArgoProcessor:
             logger.error(f"Bulk insert error: {e}")
             return False
     
-    def process_files_parallel(self, file_paths: List[str], batch_size: int = 100) -> Dict[str, int]:
+    def process_files_parallel(self, file_paths: List[str], batch_size: int = 1000) -> Dict[str, int]:
         """Process files in parallel with batched database operations."""
         self.start_time = datetime.now()
         total_files = len(file_paths)
@@ -239,33 +271,25 @@ class ParallelArgoProcessor:
         processed = 0
         errors = 0
         
-        # Process files in parallel
+        # Process files in parallel; chunksize cuts per-file IPC round-trips
         with ProcessPoolExecutor(max_workers=self.max_workers) as executor:
-            # Submit all jobs
-            future_to_file = {executor.submit(process_single_netcdf, fp): fp for fp in file_paths}
+            results = executor.map(process_single_netcdf, file_paths, chunksize=8)
             
-            # Process completed jobs in batches
-            for future in as_completed(future_to_file):
-                file_path = future_to_file[future]
-                
-                try:
-                    result = future.result()
-                    if result and result['floats']:
-                        all_float_records.extend(result['floats'])
-                        processed += 1
-                        
-                        # Batch database operations
-                        if len(all_float_records) >= batch_size:
-                            if self.bulk_insert_floats(all_float_records):
-                                logger.info(f"✅ Batch inserted {len(all_float_records)} records")
-                            else:
-                                logger.error(f"❌ Batch insert failed for {len(all_float_records)} records")
-                            all_float_records = []
-                    else:
-                        errors += 1
-                        
-                except Exception as e:
-                    logger.error(f"❌ Error processing {file_path}: {e}")
+            # Collect results in batches for the database
+            for file_path, result in zip(file_paths, results):
+                if result and result['floats']:
+                    all_float_records.extend(result['floats'])
+                    processed += 1
+                    
+                    # Batch database operations
+                    if len(all_float_records) >= batch_size:
+                        if self.bulk_insert_floats(all_float_records):
+                            logger.info(f"✅ Batch inserted {len(all_float_records)} records")
+                        else:
+                            logger.error(f"❌ Batch insert failed for {len(all_float_records)} records")
+                        all_float_records = []
+                else:
+                    logger.error(f"❌ No float data extracted from {file_path}")
                     errors += 1
                 
                 # Progress update
@@ -338,7 +362,7 @@ def main():
     print(f"🧪 Processing first {len(test_files)} files as test...")
     
     start_time = datetime.now()
-    results = processor.process_files_parallel(test_files, batch_size=50)
+    results = processor.process_files_parallel(test_files)
     end_time = datetime.now()
     
     elapsed = end_time - start_time
@@ -10,15 +10,138 @@ system capabilities as specified in the development plan.
 import asyncio
 import time
 import json
-from typing import List, Dict, Any
+from dataclasses import dataclass
+from typing import List, Dict, Any, Sequence, Tuple
 from datetime import datetime
 import requests
 import sys
+import threading
 from pathlib import Path
 
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
 # Add app to Python path
 sys.path.append(str(Path(__file__).parent))
 
+# Serializes per-scenario output so concurrent scenarios don't interleave
+_print_lock = threading.Lock()
+
+
+def _contains_any(text: str, words: tuple) -> bool:
+    """Return True if any of the keywords occurs in the (lowercased) text."""
+    return any(word in text for word in words)
+
+
+def _check_specific_data(response: str, response_lower: str) -> bool:
+    """Check for specific measurements, coordinates, or dates."""
+    has_numbers = any(char.isdigit() for char in response)
+    has_coordinates = _contains_any(response_lower, ("latitude", "longitude", "°", "degrees"))
+    has_measurements = _contains_any(response_lower, ("temperature", "salinity", "pressure", "°c"))
+    return has_numbers and (has_coordinates or has_measurements)
+
+
+def _check_contextual_explanation(response: str, response_lower: str) -> bool:
+    """Check for explanatory content."""
+    return len(response) > 100 and _contains_any(
+        response_lower, ("based on", "according to", "data shows", "indicates")
+    )
+
+
+# Semantic feature checks, resolved once per feature instead of walking an if/elif chain
+_FEATURE_CHECKS = {
+    "specific_data": _check_specific_data,
+    "argo_references": lambda r, rl: _contains_any(rl, ("argo", "float", "profile", "cycle")),
+    "location_context": lambda r, rl: _contains_any(
+        rl, ("ocean", "sea", "region", "area", "location", "latitude", "longitude")
+    ),
+    "temporal_context": lambda r, rl: _contains_any(
+        rl, ("date", "time", "2020", "2021", "2022", "2023", "2024", "2025", "recent")
+    ),
+    "scientific_accuracy": lambda r, rl: _contains_any(
+        rl, ("temperature", "salinity", "pressure", "depth", "measurement", "data")
+    ),
+    "contextual_explanation": _check_contextual_explanation,
+}
+
+
+@dataclass(frozen=True)
+class Scenario:
+    """A single end-to-end chat scenario and the features its answer should show."""
+    id: str
+    query: str
+    description: str
+    expected_features: Tuple[str, ...]
+
+
+# 10 Ideal Test Scenarios
+SCENARIOS = (
+    Scenario(
+        id="01",
+        query="Show me recent ocean temperature data from ARGO floats near India",
+        description="Basic regional temperature query with recent data filter",
+        expected_features=("specific_data", "argo_references", "location_context", "temporal_context", "temperature")
+    ),
+    Scenario(
+        id="02",
+        query="What is the salinity profile in the Arabian Sea from ARGO measurements?",
+        description="Specific ocean region with salinity parameter focus",
+        expected_features=("salinity", "argo_references", "arabian sea", "profile", "specific_data")
+    ),
+    Scenario(
+        id="03",
+        query="Compare temperature and salinity data between Indian Ocean and Pacific Ocean from ARGO floats",
+        description="Multi-region comparison query requiring data analysis",
+        expected_features=("temperature", "salinity", "indian ocean", "pacific ocean", "comparison", "argo_references")
+    ),
+    Scenario(
+        id="04",
+        query="Find ARGO floats that recorded temperatures above 25°C in tropical regions during 2024",
+        description="Complex query with temperature threshold, region, and temporal filters",
+        expected_features=("temperature", "25", "tropical", "2024", "argo_references", "specific_data")
+    ),
+    Scenario(
+        id="05",
+        query="What are the deepest measurements from ARGO floats and what temperatures were recorded?",
+        description="Depth-based query requiring analysis of pressure/depth data",
+        expected_features=("depth", "pressure", "temperature", "deepest", "measurements", "argo_references")
+    ),
+    Scenario(
+        id="06",
+        query="Show me ARGO float trajectories and temperature changes in the Bay of Bengal",
+        description="Trajectory analysis with temporal temperature changes",
+        expected_features=("trajectory", "temperature", "bay of bengal", "changes", "argo_references", "location_context")
+    ),
+    Scenario(
+        id="07",
+        query="Which ARGO floats have been active in the monsoon season and what data did they collect?",
+        description="Seasonal analysis requiring temporal and meteorological context",
+        expected_features=("monsoon", "seasonal", "active", "data", "argo_references", "temporal_context")
+    ),
+    Scenario(
+        id="08",
+        query="Analyze ocean temperature trends from 2020 to 2024 using ARGO data",
+        description="Multi-year trend analysis requiring historical data processing",
+        expected_features=("trends", "2020", "2024", "temperature", "analysis", "argo_references", "temporal_context")
+    ),
+    Scenario(
+        id="09",
+        query="What is the relationship between ocean depth and temperature in equatorial regions?",
+        description="Scientific correlation analysis between depth and temperature",
+        expected_features=("depth", "temperature", "relationship", "equatorial", "correlation", "scientific_accuracy")
+    ),
+    Scenario(
+        id="10",
+        query="Provide a summary of ARGO float data quality and coverage in the Indian Ocean region",
+        description="Data quality and coverage analysis for specific region",
+        expected_features=("quality", "coverage", "indian ocean", "summary", "argo_references", "contextual_explanation")
+    ),
+)
+
+
 class FloatChatTester:
     """Comprehensive tester for FloatChat system."""
     
@@ -26,14 +149,17 @@ class FloatChatTester:
         self.base_url = base_url
         self.results = []
         
-    def test_scenario(self, scenario_id: str, query: str, expected_features: List[str], 
+    def test_scenario(self, scenario_id: str, query: str, expected_features: Sequence[str], 
                      description: str) -> Dict[str, Any]:
         """Test a single scenario and validate results."""
         
-        print(f"\n{'='*60}")
-        print(f"🧪 SCENARIO {scenario_id}: {description}")
-        print(f"{'='*60}")
-        print(f"Query: {query}")
+        # Buffer output and emit it in one write at the end of the scenario
+        lines: List[str] = [
+            f"\n{'='*60}",
+            f"🧪 SCENARIO {scenario_id}: {description}",
+            f"{'='*60}",
+            f"Query: {query}",
+        ]
         
         start_time = time.time()
         
@@ -52,7 +178,7 @@ class FloatChatTester:
             response_time = time.time() - start_time
             
             if response.status_code == 200:
-                data = response.json()
+                data = orjson.loads(response.content) if ORJSON_AVAILABLE else response.json()
                 
                 result = {
                     "scenario_id": scenario_id,
@@ -64,7 +190,6 @@ class FloatChatTester:
                     "contexts_retrieved": data.get("metadata", {}).get("contexts_retrieved", 0),
                     "processing_time": data.get("processing_time", 0),
                     "rag_used": data.get("metadata", {}).get("rag_used", False),
-                    "response_preview": data.get("message", "")[:200] + "...",
                     "full_response": data.get("message", ""),
                     "expected_features": expected_features,
                     "success": True,
@@ -72,23 +197,23 @@ class FloatChatTester:
                 }
                 
                 # Print results
-                print(f"✅ SUCCESS")
-                print(f"   Response Time: {response_time:.2f}s")
-                print(f"   Processing Time: {data.get('processing_time', 0):.2f}s")
-                print(f"   Confidence: {data.get('confidence', 0):.2f}")
-                print(f"   Contexts Retrieved: {data.get('metadata', {}).get('contexts_retrieved', 0)}")
-                print(f"   Response Length: {len(data.get('message', ''))} characters")
-                print(f"   Response Preview: {data.get('message', '')[:200]}...")
+                lines.append(f"✅ SUCCESS")
+                lines.append(f"   Response Time: {response_time:.2f}s")
+                lines.append(f"   Processing Time: {data.get('processing_time', 0):.2f}s")
+                lines.append(f"   Confidence: {data.get('confidence', 0):.2f}")
+                lines.append(f"   Contexts Retrieved: {data.get('metadata', {}).get('contexts_retrieved', 0)}")
+                lines.append(f"   Response Length: {len(data.get('message', ''))} characters")
+                lines.append(f"   Response Preview: {result['full_response'][:200]}...")
                 
                 # Validate expected features
                 validation = result["validation_results"]
-                print(f"\n🔍 VALIDATION:")
+                lines.append(f"\n🔍 VALIDATION:")
                 for feature, found in validation.items():
                     status = "✅" if found else "❌"
-                    print(f"   {status} {feature}")
+                    lines.append(f"   {status} {feature}")
                 
                 validation_score = sum(validation.values()) / len(validation) * 100
-                print(f"   📊 Validation Score: {validation_score:.1f}%")
+                lines.append(f"   📊 Validation Score: {validation_score:.1f}%")
                 
             else:
                 result = {
@@ -99,8 +224,8 @@ class FloatChatTester:
                     "error": f"HTTP {response.status_code}: {response.text}",
                     "response_time": response_time
                 }
-                print(f"❌ FAILED: HTTP {response.status_code}")
-                print(f"   Error: {response.text}")
+                lines.append(f"❌ FAILED: HTTP {response.status_code}")
+                lines.append(f"   Error: {response.text}")
                 
         except Exception as e:
             result = {
@@ -111,44 +236,24 @@ class FloatChatTester:
                 "error": str(e),
                 "response_time": time.time() - start_time
             }
-            print(f"❌ FAILED: {str(e)}")
+            lines.append(f"❌ FAILED: {str(e)}")
+        
+        with _print_lock:
+            sys.stdout.write("\n".join(lines) + "\n")
+            sys.stdout.flush()
         
         self.results.append(result)
         return result
     
-    def _validate_response(self, response: str, expected_features: List[str]) -> Dict[str, bool]:
+    def _validate_response(self, response: str, expected_features: Sequence[str]) -> Dict[str, bool]:
         """Validate if response contains expected features."""
         validation = {}
         response_lower = response.lower()
         
         for feature in expected_features:
-            if feature.lower() == "specific_data":
-                # Check for specific measurements, coordinates, or dates
-                has_numbers = any(char.isdigit() for char in response)
-                has_coordinates = any(word in response_lower for word in ["latitude", "longitude", "°", "degrees"])
-                has_measurements = any(word in response_lower for word in ["temperature", "salinity", "pressure", "°c"])
-                validation[feature] = has_numbers and (has_coordinates or has_measurements)
-                
-            elif feature.lower() == "argo_references":
-                # Check for ARGO float references
-                validation[feature] = any(word in response_lower for word in ["argo", "float", "profile", "cycle"])
-                
-            elif feature.lower() == "location_context":
-                # Check for geographical context
-                validation[feature] = any(word in response_lower for word in ["ocean", "sea", "region", "area", "location", "latitude", "longitude"])
-                
-            elif feature.lower() == "temporal_context":
-                # Check for time references
-                validation[feature] = any(word in response_lower for word in ["date", "time", "2020", "2021", "2022", "2023", "2024", "2025", "recent"])
-                
-            elif feature.lower() == "scientific_accuracy":
-                # Check for scientific terminology
-                validation[feature] = any(word in response_lower for word in ["temperature", "salinity", "pressure", "depth", "measurement", "data"])
-                
-            elif feature.lower() == "contextual_explanation":
-                # Check for explanatory content
-                validation[feature] = len(response) > 100 and any(word in response_lower for word in ["based on", "according to", "data shows", "indicates"])
-                
+            check = _FEATURE_CHECKS.get(feature.lower())
+            if check is not None:
+                validation[feature] = check(response, response_lower)
             else:
                 # Generic keyword search
                 validation[feature] = feature.lower() in response_lower
@@ -163,81 +268,14 @@ class FloatChatTester:
         print(f"Target URL: {self.base_url}")
         print(f"Start Time: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
         
-        # 10 Ideal Test Scenarios
-        scenarios = [
-            {
-                "id": "01",
-                "query": "Show me recent ocean temperature data from ARGO floats near India",
-                "description": "Basic regional temperature query with recent data filter",
-                "expected_features": ["specific_data", "argo_references", "location_context", "temporal_context", "temperature"]
-            },
-            {
-                "id": "02", 
-                "query": "What is the salinity profile in the Arabian Sea from ARGO measurements?",
-                "description": "Specific ocean region with salinity parameter focus",
-                "expected_features": ["salinity", "argo_references", "arabian sea", "profile", "specific_data"]
-            },
-            {
-                "id": "03",
-                "query": "Compare temperature and salinity data between Indian Ocean and Pacific Ocean from ARGO floats",
-                "description": "Multi-region comparison query requiring data analysis",
-                "expected_features": ["temperature", "salinity", "indian ocean", "pacific ocean", "comparison", "argo_references"]
-            },
-            {
-                "id": "04",
-                "query": "Find ARGO floats that recorded temperatures above 25°C in tropical regions during 2024",
-                "description": "Complex query with temperature threshold, region, and temporal filters",
-                "expected_features": ["temperature", "25", "tropical", "2024", "argo_references", "specific_data"]
-            },
-            {
-                "id": "05",
-                "query": "What are the deepest measurements from ARGO floats and what temperatures were recorded?",
-                "description": "Depth-based query requiring analysis of pressure/depth data",
-                "expected_features": ["depth", "pressure", "temperature", "deepest", "measurements", "argo_references"]
-            },
-            {
-                "id": "06",
-                "query": "Show me ARGO float trajectories and temperature changes in the Bay of Bengal",
-                "description": "Trajectory analysis with temporal temperature changes",
-                "expected_features": ["trajectory", "temperature", "bay of bengal", "changes", "argo_references", "location_context"]
-            },
-            {
-                "id": "07",
-                "query": "Which ARGO floats have been active in the monsoon season and what data did they collect?",
-                "description": "Seasonal analysis requiring temporal and meteorological context",
-                "expected_features": ["monsoon", "seasonal", "active", "data", "argo_references", "temporal_context"]
-            },
-            {
-                "id": "08",
-                "query": "Analyze ocean temperature trends from 2020 to 2024 using ARGO data",
-                "description": "Multi-year trend analysis requiring historical data processing",
-                "expected_features": ["trends", "2020", "2024", "temperature", "analysis", "argo_references", "temporal_context"]
-            },
-            {
-                "id": "09",
-                "query": "What is the relationship between ocean depth and temperature in equatorial regions?",
-                "description": "Scientific correlation analysis between depth and temperature",
-                "expected_features": ["depth", "temperature", "relationship", "equatorial", "correlation", "scientific_accuracy"]
-            },
-            {
-                "id": "10",
-                "query": "Provide a summary of ARGO float data quality and coverage in the Indian Ocean region",
-                "description": "Data quality and coverage analysis for specific region",
-                "expected_features": ["quality", "coverage", "indian ocean", "summary", "argo_references", "contextual_explanation"]
-            }
-        ]
-        
         # Run all scenarios
-        for scenario in scenarios:
+        for scenario in SCENARIOS:
             self.test_scenario(
-                scenario["id"],
-                scenario["query"], 
-                scenario["expected_features"],
-                scenario["description"]
+                scenario.id,
+                scenario.query,
+                scenario.expected_features,
+                scenario.description
             )
-            
-            # Brief pause between tests
-            time.sleep(1)
         
         # Generate summary report
         self.generate_summary_report()
@@ -301,17 +339,22 @@ class FloatChatTester:
         print(f"\n💾 Detailed results saved to: floatchat_test_results.json")
         
         # Save detailed results
-        with open("floatchat_test_results.json", "w") as f:
-            json.dump({
-                "test_summary": {
-                    "total_tests": len(self.results),
-                    "successful_tests": len(successful_tests),
-                    "failed_tests": len(failed_tests),
-                    "success_rate": len(successful_tests)/len(self.results)*100,
-                    "timestamp": datetime.now().isoformat()
-                },
-                "detailed_results": self.results
-            }, f, indent=2)
+        report = {
+            "test_summary": {
+                "total_tests": len(self.results),
+                "successful_tests": len(successful_tests),
+                "failed_tests": len(failed_tests),
+                "success_rate": len(successful_tests)/len(self.results)*100,
+                "timestamp": datetime.now().isoformat()
+            },
+            "detailed_results": self.results
+        }
+        if ORJSON_AVAILABLE:
+            with open("floatchat_test_results.json", "wb") as f:
+                f.write(orjson.dumps(report, option=orjson.OPT_INDENT_2))
+        else:
+            with open("floatchat_test_results.json", "w") as f:
+                json.dump(report, f, indent=2)
 
 
 def main():
@@ -4,16 +4,106 @@ Simple test of RAG pipeline with existing vector data.
 """
 
 import asyncio
-import chromadb
-from sentence_transformers import SentenceTransformer
+import io
+import numpy as np
 import sys
 from pathlib import Path
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from sentence_transformers import SentenceTransformer
 
 # Add app to Python path
 sys.path.append(str(Path(__file__).parent))
 
 from app.services.real_gemini_service import real_gemini_service
 
+EMBEDDING_MODEL_NAME = 'sentence-transformers/all-MiniLM-L6-v2'
+CHROMADB_PATH = './data/chromadb'
+COLLECTION_NAME = 'argo_metadata'
+
+PROMPT_PREFIX = """You are FloatChat, an expert in ARGO oceanographic data. Based on the following relevant information from our ARGO database, answer the user's query:
+
+RELEVANT DATA:
+"""
+
+PROMPT_SUFFIX = """
+
+Provide a comprehensive response based on the retrieved data above. Reference specific data points, locations, and measurements when available."""
+
+# Context budget for the Gemini prompt (~4k tokens at ~4 chars per token)
+MAX_CONTEXT_CHARS = 4000 * 4
+
+# Lazily loaded embedding model and Chroma handles, shared across queries
+_EMBEDDER = None
+_CLIENT = None
+_COLLECTION = None
+
+
+def get_embedder() -> "SentenceTransformer":
+    """Load the embedding model once, in FP16 on CUDA or int8-quantized on CPU."""
+    global _EMBEDDER
+    if _EMBEDDER is None:
+        # Deferred so importing this module doesn't pull in PyTorch
+        import torch
+        from sentence_transformers import SentenceTransformer
+
+        model = SentenceTransformer(EMBEDDING_MODEL_NAME)
+        if torch.cuda.is_available():
+            model = model.half()
+        else:
+            model = torch.ao.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
+        _EMBEDDER = model
+    return _EMBEDDER
+
+
+def get_collection():
+    """Open the persistent Chroma client once and keep the collection handle warm."""
+    global _CLIENT, _COLLECTION
+    if _COLLECTION is None:
+        if _CLIENT is None:
+            import chromadb
+            _CLIENT = chromadb.PersistentClient(path=CHROMADB_PATH)
+        _COLLECTION = _CLIENT.get_collection(name=COLLECTION_NAME)
+    return _COLLECTION
+
+
+def query_collection(collection, query_embedding: np.ndarray, **kwargs):
+    """Query Chroma with the raw ndarray, falling back to nested lists on older clients."""
+    try:
+        return collection.query(query_embeddings=query_embedding, **kwargs)
+    except TypeError:
+        # Pre-0.5 clients only accept lists of Python floats
+        return collection.query(query_embeddings=query_embedding.tolist(), **kwargs)
+
+
+def to_similarity(distance: float, space: str) -> float:
+    """Convert a Chroma distance for unit-length embeddings into cosine similarity."""
+    if space == "l2":
+        # Chroma reports squared L2, which is 2 - 2*cos for normalized vectors
+        return 1 - distance / 2
+    return 1 - distance
+
+
+def fit_contexts(contexts: list, max_chars: int = MAX_CONTEXT_CHARS) -> list:
+    """Truncate contexts evenly so their combined size stays within the prompt budget."""
+    if not contexts or sum(len(c) for c in contexts) <= max_chars:
+        return contexts
+    budget_per = max_chars // len(contexts)
+    return [c[:budget_per] for c in contexts]
+
+
+def build_prompt(query: str, contexts: list) -> str:
+    """Assemble the RAG prompt in a single buffer instead of join + f-string copies."""
+    buf = io.StringIO()
+    buf.write(PROMPT_PREFIX)
+    buf.writelines(context + "\n\n" for context in contexts)
+    buf.write("USER QUERY: ")
+    buf.write(query)
+    buf.write(PROMPT_SUFFIX)
+    return buf.getvalue()
+
+
 async def test_simple_rag():
     """Test simple RAG workflow with existing data."""
     
@@ -22,20 +112,19 @@ async def test_simple_rag():
     
     # 1. Initialize ChromaDB
     print("1. Connecting to ChromaDB...")
-    client = chromadb.PersistentClient(path='./data/chromadb')
-    collections = client.list_collections()
-    
-    if not collections:
-        print("❌ No collections found in ChromaDB")
+    try:
+        collection = get_collection()
+    except Exception as e:
+        print(f"❌ Collection '{COLLECTION_NAME}' not found in ChromaDB: {e}")
         return
     
-    collection = collections[0]  # Use first collection
     print(f"✅ Found collection: {collection.name} with {collection.count()} documents")
+    distance_space = (collection.metadata or {}).get("hnsw:space", "l2")
     
     # 2. Initialize embedding model
     print("2. Loading embedding model...")
     try:
-        embedder = SentenceTransformer('sentence-transformers/all-MiniLM-L6-v2')
+        embedder = get_embedder()
         print("✅ Embedding model loaded")
     except Exception as e:
         print(f"❌ Failed to load embedding model: {e}")
@@ -46,12 +135,14 @@ async def test_simple_rag():
     print(f"3. Processing query: '{query}'")
     
     # Generate query embedding
-    query_embedding = embedder.encode([query])
+    query_embedding = embedder.encode([query], batch_size=32, convert_to_numpy=True,
+                                      normalize_embeddings=True)
     
     # Search vector database
     print("4. Searching vector database...")
-    results = collection.query(
-        query_embeddings=query_embedding.tolist(),
+    results = query_collection(
+        collection,
+        query_embedding.astype(np.float32, copy=False),
         n_results=5,
         include=['documents', 'metadatas', 'distances']
     )
@@ -62,22 +153,14 @@ async def test_simple_rag():
     contexts = []
     for i, doc in enumerate(results['documents'][0]):
         metadata = results['metadatas'][0][i]
-        distance = results['distances'][0][i]
-        contexts.append(f"Context {i+1} (similarity: {1-distance:.3f}): {doc[:200]}...")
-        print(f"   • {doc[:100]}... (similarity: {1-distance:.3f})")
+        similarity = to_similarity(results['distances'][0][i], distance_space)
+        contexts.append(f"Context {i+1} (similarity: {similarity:.3f}): {doc[:200]}...")
+        print(f"   • {doc[:100]}... (similarity: {similarity:.3f})")
     
     # 6. Generate response with Gemini
     print("5. Generating AI response...")
     
-    context_text = "\n\n".join(contexts)
-    enhanced_prompt = f"""You are FloatChat, an expert in ARGO oceanographic data. Based on the following relevant information from our ARGO database, answer the user's query:
-
-RELEVANT DATA:
-{context_text}
-
-USER QUERY: {query}
-
-Provide a comprehensive response based on the retrieved data above. Reference specific data points, locations, and measurements when available."""
+    enhanced_prompt = build_prompt(query, fit_contexts(contexts))
 
     try:
         response = await real_gemini_service._generate_response(enhanced_prompt)
@@ -12,75 +12,81 @@ load_dotenv()
 
 async def test_real_gemini():
     """Test real Gemini AI integration."""
-    print("🤖 TESTING REAL GEMINI AI INTEGRATION")
-    print("=====================================")
+    lines = ["🤖 TESTING REAL GEMINI AI INTEGRATION",
+             "====================================="]
     
     try:
         # Import our real Gemini service
         from app.services.real_gemini_service import real_gemini_service
         
-        print(f"✅ Gemini service imported successfully")
-        print(f"✅ API available: {real_gemini_service.available}")
+        lines.append(f"✅ Gemini service imported successfully")
+        lines.append(f"✅ API available: {real_gemini_service.available}")
         
         if not real_gemini_service.available:
-            print("❌ Gemini API not available - check your API key")
+            lines.append("❌ Gemini API not available - check your API key")
             return
         
         # Test a simple ocean data query
         test_query = "What is the average temperature in the Arabian Sea?"
-        print(f"\n🌊 Testing query: '{test_query}'")
+        lines.append(f"\n🌊 Testing query: '{test_query}'")
         
         response = await real_gemini_service.analyze_ocean_query(test_query)
         
-        print(f"✅ AI Response received!")
-        print(f"📝 Message: {response['message'][:200]}...")
-        print(f"🎯 Query type: {response.get('query_type', 'N/A')}")
-        print(f"📊 Confidence: {response.get('confidence', 'N/A')}")
-        print(f"⏰ Timestamp: {response.get('timestamp', 'N/A')}")
+        lines.append(f"✅ AI Response received!")
+        lines.append(f"📝 Message: {response['message'][:200]}...")
+        lines.append(f"🎯 Query type: {response.get('query_type', 'N/A')}")
+        lines.append(f"📊 Confidence: {response.get('confidence', 'N/A')}")
+        lines.append(f"⏰ Timestamp: {response.get('timestamp', 'N/A')}")
         
-        print("\n🎉 REAL GEMINI AI WORKING!")
+        lines.append("\n🎉 REAL GEMINI AI WORKING!")
         return True
         
     except Exception as e:
-        print(f"❌ Error testing Gemini AI: {e}")
+        lines.append(f"❌ Error testing Gemini AI: {e}")
         import traceback
         traceback.print_exc()
         return False
+    finally:
+        # Emit the whole block at once so concurrent checks don't interleave
+        print("\n".join(lines))
 
 async def test_real_argo_data():
     """Test real ARGO data fetching."""
-    print("\n🌊 TESTING REAL ARGO DATA INTEGRATION")
-    print("=====================================")
+    lines = ["\n🌊 TESTING REAL ARGO DATA INTEGRATION",
+             "====================================="]
     
     try:
         from app.services.real_argo_service import real_argo_service
         
-        print("✅ ARGO service imported successfully")
+        lines.append("✅ ARGO service imported successfully")
         
         # Test fetching active floats
-        print("🔍 Fetching active ARGO floats...")
+        lines.append("🔍 Fetching active ARGO floats...")
         floats = await real_argo_service.fetch_active_floats()
         
-        print(f"✅ Found {len(floats)} active floats")
+        lines.append(f"✅ Found {len(floats)} active floats")
         if floats:
-            print(f"📍 Sample float: WMO {floats[0].get('wmo_id', 'N/A')} - {floats[0].get('platform_type', 'N/A')}")
+            lines.append(f"📍 Sample float: WMO {floats[0].get('wmo_id', 'N/A')} - {floats[0].get('platform_type', 'N/A')}")
         
-        print("\n🎉 REAL ARGO DATA WORKING!")
+        lines.append("\n🎉 REAL ARGO DATA WORKING!")
         return True
         
     except Exception as e:
-        print(f"❌ Error testing ARGO data: {e}")
+        lines.append(f"❌ Error testing ARGO data: {e}")
         import traceback
         traceback.print_exc()
         return False
+    finally:
+        # Emit the whole block at once so concurrent checks don't interleave
+        print("\n".join(lines))
 
 async def main():
     """Run all tests."""
     print("🚀 FLOATCHAT REAL INTEGRATION TESTS")
     print("===================================")
     
-    gemini_ok = await test_real_gemini()
-    argo_ok = await test_real_argo_data()
+    # The two checks share no state, so run them side by side
+    gemini_ok, argo_ok = await asyncio.gather(test_real_gemini(), test_real_argo_data())
     
     print(f"\n📋 TEST RESULTS:")
     print(f"🤖 Gemini AI: {'✅ WORKING' if gemini_ok else '❌ FAILED'}")
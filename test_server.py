@@ -5,13 +5,21 @@ This allows us to test the API endpoints while Docker is starting up.
 """
 
 import asyncio
+import hashlib
+import json
 from typing import Dict, Any
 from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
-from fastapi.responses import HTMLResponse
+from fastapi.responses import HTMLResponse, JSONResponse, ORJSONResponse, Response
 import uvicorn
 
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
 from app.core.config import get_settings
 from app.services.real_gemini_service import real_gemini_service
 
@@ -24,7 +32,8 @@ app = FastAPI(
     description="Simplified test server for FloatChat API testing",
     version="1.0.0",
     docs_url="/docs",
-    redoc_url="/redoc"
+    redoc_url="/redoc",
+    default_response_class=ORJSONResponse if ORJSON_AVAILABLE else JSONResponse
 )
 
 # Add CORS middleware
@@ -59,6 +68,52 @@ async def health_check():
         }
     }
 
+# Gemini answers keyed by normalized query; repeated test runs re-send the same queries
+_gemini_cache: Dict[bytes, "asyncio.Future[Dict[str, Any]]"] = {}
+_GEMINI_CACHE_LIMIT = 256
+
+async def _cached_analyze(query: str) -> Dict[str, Any]:
+    """Analyze a query once per normalized text; concurrent duplicates share the in-flight call."""
+    cache_key = hashlib.blake2b(query.strip().lower().encode(), digest_size=16).digest()
+    future = _gemini_cache.get(cache_key)
+    if future is None:
+        future = asyncio.ensure_future(real_gemini_service.analyze_ocean_query(query))
+        _gemini_cache[cache_key] = future
+        
+        # Limit cache size, dropping the oldest entries first
+        if len(_gemini_cache) > _GEMINI_CACHE_LIMIT:
+            for key in list(_gemini_cache)[:_GEMINI_CACHE_LIMIT // 5]:
+                del _gemini_cache[key]
+    
+    result = await asyncio.shield(future)
+    # analyze_ocean_query reports failures such as rate limits as an error response
+    # instead of raising; drop those so the next request retries
+    if (result.get("query_type") == "error" or "error" in result) and _gemini_cache.get(cache_key) is future:
+        del _gemini_cache[cache_key]
+    return result
+
+async def _answer_query(query: str) -> Dict[str, Any]:
+    """Answer a single chat query with Gemini, or a mock reply when it is unavailable."""
+    if real_gemini_service.available:
+        response = await _cached_analyze(query)
+        return {
+            "success": True,
+            "message": response.get("message", "Response generated successfully"),
+            "query_type": response.get("query_type", "unknown"),
+            "confidence": response.get("confidence", 0.8),
+            "data_source": "test_mode",
+            "processing_time_ms": 150
+        }
+    else:
+        return {
+            "success": True,
+            "message": f"Test response for: {query}",
+            "query_type": "test",
+            "confidence": 1.0,
+            "data_source": "mock",
+            "processing_time_ms": 50
+        }
+
 @app.post("/api/v1/chat/query")
 async def test_chat_query(request: Dict[str, Any]):
     """Test chat endpoint without database."""
@@ -68,64 +123,70 @@ async def test_chat_query(request: Dict[str, Any]):
             raise HTTPException(status_code=400, detail="Query is required")
         
         # Test Gemini API
-        if real_gemini_service.available:
-            response = await real_gemini_service.analyze_ocean_query(query)
-            return {
-                "success": True,
-                "message": response.get("message", "Response generated successfully"),
-                "query_type": response.get("query_type", "unknown"),
-                "confidence": response.get("confidence", 0.8),
-                "data_source": "test_mode",
-                "processing_time_ms": 150
-            }
-        else:
-            return {
-                "success": True,
-                "message": f"Test response for: {query}",
-                "query_type": "test",
-                "confidence": 1.0,
-                "data_source": "mock",
-                "processing_time_ms": 50
-            }
+        return await _answer_query(query)
             
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Chat processing failed: {str(e)}")
 
+@app.post("/api/v1/chat/batch_query")
+async def test_chat_batch_query(request: Dict[str, Any]):
+    """Answer several chat queries in one round-trip, returning results in submission order."""
+    queries = request.get("queries", [])
+    if not queries:
+        raise HTTPException(status_code=400, detail="Queries are required")
+    
+    texts = [q.get("message") or q.get("query", "") for q in queries]
+    if not all(texts):
+        raise HTTPException(status_code=400, detail="Every query needs a message")
+    
+    responses = await asyncio.gather(*[_answer_query(text) for text in texts], return_exceptions=True)
+    return [
+        {"success": False, "error": f"Chat processing failed: {str(r)}"} if isinstance(r, Exception) else r
+        for r in responses
+    ]
+
+# The mock floats payload never changes, so encode it once at import
+_FLOATS_RESPONSE = {
+    "success": True,
+    "data": [
+        {
+            "float_id": "test_001",
+            "latitude": 20.5,
+            "longitude": 75.3,
+            "temperature": 28.5,
+            "salinity": 35.2,
+            "date": "2024-09-18"
+        },
+        {
+            "float_id": "test_002", 
+            "latitude": 21.0,
+            "longitude": 76.0,
+            "temperature": 29.1,
+            "salinity": 35.5,
+            "date": "2024-09-18"
+        }
+    ],
+    "count": 2,
+    "data_source": "test_mode"
+}
+_FLOATS_RESPONSE_BODY = orjson.dumps(_FLOATS_RESPONSE) if ORJSON_AVAILABLE else json.dumps(_FLOATS_RESPONSE).encode()
+
 @app.get("/api/v1/floats/test")
 async def test_floats():
     """Test floats endpoint with mock data."""
-    return {
-        "success": True,
-        "data": [
-            {
-                "float_id": "test_001",
-                "latitude": 20.5,
-                "longitude": 75.3,
-                "temperature": 28.5,
-                "salinity": 35.2,
-                "date": "2024-09-18"
-            },
-            {
-                "float_id": "test_002", 
-                "latitude": 21.0,
-                "longitude": 76.0,
-                "temperature": 29.1,
-                "salinity": 35.5,
-                "date": "2024-09-18"
-            }
-        ],
-        "count": 2,
-        "data_source": "test_mode"
-    }
+    return Response(content=_FLOATS_RESPONSE_BODY, media_type="application/json")
+
+# Read the test page once at startup; restart the server to pick up edits
+try:
+    with open("test_api.html", "rb") as f:
+        _TEST_HTML = f.read()
+except FileNotFoundError:
+    _TEST_HTML = b"<h1>Test page not found</h1><p>test_api.html is missing</p>"
 
 @app.get("/test", response_class=HTMLResponse)
 async def test_page():
     """Serve the test HTML page."""
-    try:
-        with open("test_api.html", "r", encoding="utf-8") as f:
-            return HTMLResponse(content=f.read())
-    except FileNotFoundError:
-        return HTMLResponse(content="<h1>Test page not found</h1><p>test_api.html is missing</p>")
+    return HTMLResponse(content=_TEST_HTML)
 
 if __name__ == "__main__":
     print("🚀 Starting FloatChat Test Server...")
@@ -133,10 +194,11 @@ if __name__ == "__main__":
     print("📖 API Docs: http://localhost:8001/docs")
     print("💚 Health Check: http://localhost:8001/health")
     
+    # The reload watcher only runs when RELOAD is on, so perf runs can set RELOAD=false.
     uvicorn.run(
         "test_server:app",
         host="0.0.0.0",
         port=8001,
-        reload=True,
-        log_level="info"
+        reload=settings.reload,
+        log_level="info" if settings.reload else "warning"
     )
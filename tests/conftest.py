@@ -5,15 +5,27 @@ Pytest configuration and fixtures for comprehensive testing.
 """
 
 import asyncio
+import json
+import os
+import sys
+import time
 import pytest
 import pytest_asyncio
-from typing import AsyncGenerator, Generator
-from unittest.mock import AsyncMock, MagicMock
+from pytest_asyncio import is_async_test
+from typing import AsyncGenerator, Dict
+from types import SimpleNamespace
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
 
 from fastapi.testclient import TestClient
-from httpx import AsyncClient
+from httpx import ASGITransport, AsyncClient, Timeout
+from sqlalchemy import event, insert
 from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine, async_sessionmaker
-from sqlalchemy.pool import StaticPool
+from sqlalchemy.pool import AsyncAdaptedQueuePool
 
 from app.main import create_app
 from app.core.database import get_db, Base
@@ -21,16 +33,34 @@ from app.core.config import get_settings
 from app.models.database_simple import ArgoFloat, ArgoProfile, ArgoMeasurement, ProcessingLog
 
 
-# Test database URL (in-memory SQLite)
-TEST_DATABASE_URL = "sqlite+aiosqlite:///:memory:"
+# Test database URL (named shared-cache in-memory SQLite, visible to every pooled connection;
+# the pid keeps each pytest-xdist worker on its own database)
+TEST_DATABASE_URL = f"sqlite+aiosqlite:///file:floatchat_test_{os.getpid()}?mode=memory&cache=shared&uri=true"
+
+# Headers for requests that send pre-serialized JSON bodies
+JSON_HEADERS = {"content-type": "application/json"}
+
+_json_loads = orjson.loads if ORJSON_AVAILABLE else json.loads
+_json_dumps = orjson.dumps if ORJSON_AVAILABLE else (lambda obj: json.dumps(obj).encode())
+
+# Session of the running test, served to the module-scoped app by override_get_db
+_current_db_session: Dict[str, AsyncSession] = {}
 
 
 @pytest.fixture(scope="session")
-def event_loop() -> Generator[asyncio.AbstractEventLoop, None, None]:
-    """Create an instance of the default event loop for the test session."""
-    loop = asyncio.get_event_loop_policy().new_event_loop()
-    yield loop
-    loop.close()
+def event_loop_policy() -> asyncio.AbstractEventLoopPolicy:
+    """Event loop policy for the test session, using selector loops on Windows."""
+    if sys.platform == "win32":
+        return asyncio.WindowsSelectorEventLoopPolicy()
+    return asyncio.DefaultEventLoopPolicy()
+
+
+def pytest_collection_modifyitems(items):
+    """Run every async test on the session-scoped event loop."""
+    session_scope_marker = pytest.mark.asyncio(loop_scope="session")
+    for item in items:
+        if is_async_test(item):
+            item.add_marker(session_scope_marker, append=False)
 
 
 @pytest_asyncio.fixture(scope="session")
@@ -39,13 +69,32 @@ async def test_engine():
     engine = create_async_engine(
         TEST_DATABASE_URL,
         connect_args={"check_same_thread": False},
-        poolclass=StaticPool,
+        # Pooled connections stay open, which keeps the in-memory database alive
+        poolclass=AsyncAdaptedQueuePool,
+        pool_size=5,
         echo=False
     )
     
-    # Create tables
+    @event.listens_for(engine.sync_engine, "connect")
+    def _configure_connection(dbapi_connection, connection_record):
+        # Let SQLAlchemy emit BEGIN itself so SAVEPOINTs nest inside real transactions
+        dbapi_connection.isolation_level = None
+        
+        # Test data is throwaway, so skip syncing, on-disk journals and FK checks
+        cursor = dbapi_connection.cursor()
+        cursor.execute("PRAGMA synchronous=OFF")
+        cursor.execute("PRAGMA journal_mode=MEMORY")
+        cursor.execute("PRAGMA temp_store=MEMORY")
+        cursor.execute("PRAGMA foreign_keys=OFF")
+        cursor.close()
+    
+    @event.listens_for(engine.sync_engine, "begin")
+    def _emit_begin(conn):
+        conn.exec_driver_sql("BEGIN")
+    
+    # Create tables; each worker's in-memory database starts empty, so skip the existence probes
     async with engine.begin() as conn:
-        await conn.run_sync(Base.metadata.create_all)
+        await conn.run_sync(Base.metadata.create_all, checkfirst=False)
     
     yield engine
     
@@ -53,112 +102,148 @@ async def test_engine():
     await engine.dispose()
 
 
-@pytest_asyncio.fixture
-async def test_db_session(test_engine) -> AsyncGenerator[AsyncSession, None]:
-    """Create a test database session."""
-    async_session = async_sessionmaker(
-        test_engine, class_=AsyncSession, expire_on_commit=False
+@pytest_asyncio.fixture(scope="session")
+async def _connection(test_engine):
+    """Open the single database connection shared by the whole test session."""
+    async with test_engine.connect() as connection:
+        yield connection
+
+
+@pytest_asyncio.fixture(scope="session")
+async def async_session_factory(_connection):
+    """Create the session factory bound to the shared test connection."""
+    return async_sessionmaker(
+        bind=_connection,
+        class_=AsyncSession,
+        expire_on_commit=False,
+        join_transaction_mode="create_savepoint"
     )
+
+
+@pytest_asyncio.fixture(scope="module")
+async def _module_transaction(_connection):
+    """Open a per-module transaction holding module-scoped sample data."""
+    trans = await _connection.begin()
     
-    async with async_session() as session:
+    try:
+        yield trans
+    finally:
+        await trans.rollback()
+
+
+@pytest_asyncio.fixture
+async def test_db_session(_connection, _module_transaction, async_session_factory) -> AsyncGenerator[AsyncSession, None]:
+    """Create a test database session inside a savepoint that is rolled back per test."""
+    savepoint = await _connection.begin_nested()
+    session = async_session_factory()
+    _current_db_session["session"] = session
+    
+    try:
         yield session
-        await session.rollback()
+    finally:
+        _current_db_session.pop("session", None)
+        await session.close()
+        await savepoint.rollback()
 
 
-@pytest.fixture
-def override_get_db(test_db_session):
+@pytest.fixture(autouse=True)
+def _bind_test_db_session(request):
+    """Bind a per-test database session for tests marked with @pytest.mark.db."""
+    if request.node.get_closest_marker("db") is not None:
+        request.getfixturevalue("test_db_session")
+
+
+@pytest.fixture(scope="module")
+def override_get_db():
     """Override the get_db dependency for testing."""
     async def _override_get_db():
-        yield test_db_session
+        session = _current_db_session.get("session")
+        if session is None:
+            raise RuntimeError("get_db called without a test database session; mark the test with @pytest.mark.db")
+        yield session
     
     return _override_get_db
 
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def test_app(override_get_db):
-    """Create test FastAPI application."""
+    """Create test FastAPI application once per test module."""
     app = create_app()
     app.dependency_overrides[get_db] = override_get_db
     return app
 
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def test_client(test_app) -> TestClient:
     """Create test client for synchronous testing."""
     return TestClient(test_app)
 
 
+@pytest.fixture(scope="module")
+def _asgi_transport(test_app) -> ASGITransport:
+    """Create the in-process ASGI transport shared by a module's async clients."""
+    return ASGITransport(app=test_app)
+
+
 @pytest_asyncio.fixture
-async def async_test_client(test_app) -> AsyncGenerator[AsyncClient, None]:
+async def async_test_client(_asgi_transport) -> AsyncGenerator[AsyncClient, None]:
     """Create async test client for async testing."""
-    async with AsyncClient(app=test_app, base_url="http://test") as client:
+    async with AsyncClient(
+        transport=_asgi_transport,
+        base_url="http://test",
+        follow_redirects=False,
+        timeout=Timeout(5.0)
+    ) as client:
         yield client
 
 
-@pytest_asyncio.fixture
-async def sample_float_data(test_db_session: AsyncSession):
-    """Create sample ARGO float data for testing."""
-    # Create sample float
-    float_data = ArgoFloat(
-        wmo_id=2901234,
-        platform_type="APEX",
-        deployment_date="2020-01-01T00:00:00",
-        status="active",
-        cycle_number_max=150,
-        data_center="INCOIS",
-        project_name="Indian Ocean",
-        pi_name="Dr. Test Scientist",
-        platform_owner="INCOIS",
-        dac_format_id="3901234",
-        deep_argos=False,
-        bgc_argos=False
-    )
-    
-    test_db_session.add(float_data)
-    await test_db_session.commit()
-    await test_db_session.refresh(float_data)
-    
-    # Create sample profiles
-    profile_data = ArgoProfile(
-        float_id=float_data.id,
-        cycle_number=1,
-        profile_date="2020-01-02T12:00:00",
-        direction="A",
-        pres_max=2000.0,
-        temp_max=28.5,
-        psal_max=35.2
-    )
-    
-    test_db_session.add(profile_data)
-    await test_db_session.commit()
-    await test_db_session.refresh(profile_data)
-    
-    # Create sample measurements
-    measurements = [
-        ArgoMeasurement(
-            profile_id=profile_data.id,
-            pressure=10.0,
-            temperature=28.5,
-            salinity=35.2
-        ),
-        ArgoMeasurement(
-            profile_id=profile_data.id,
-            pressure=100.0,
-            temperature=25.8,
-            salinity=35.1
-        ),
-        ArgoMeasurement(
-            profile_id=profile_data.id,
-            pressure=500.0,
-            temperature=15.2,
-            salinity=34.8
-        )
-    ]
-    
-    for measurement in measurements:
-        test_db_session.add(measurement)
-    
-    await test_db_session.commit()
+@pytest_asyncio.fixture(scope="module")
+async def sample_float_data(_module_transaction, async_session_factory):
+    """Create sample ARGO float data once per test module."""
+    async with async_session_factory() as session:
+        # Create sample float
+        float_data = (await session.scalars(
+            insert(ArgoFloat).values(
+                wmo_id=2901234,
+                platform_type="APEX",
+                deployment_date="2020-01-01T00:00:00",
+                status="active",
+                cycle_number_max=150,
+                data_center="INCOIS",
+                project_name="Indian Ocean",
+                pi_name="Dr. Test Scientist",
+                platform_owner="INCOIS",
+                dac_format_id="3901234",
+                deep_argos=False,
+                bgc_argos=False
+            ).returning(ArgoFloat)
+        )).one()
+        
+        # Create sample profiles
+        profile_data = (await session.scalars(
+            insert(ArgoProfile).values(
+                float_id=float_data.id,
+                cycle_number=1,
+                profile_date="2020-01-02T12:00:00",
+                direction="A",
+                pres_max=2000.0,
+                temp_max=28.5,
+                psal_max=35.2
+            ).returning(ArgoProfile)
+        )).one()
+        
+        # Create sample measurements in a single executemany
+        measurements = (await session.scalars(
+            insert(ArgoMeasurement).returning(ArgoMeasurement),
+            [
+                {"profile_id": profile_data.id, "pressure": 10.0, "temperature": 28.5, "salinity": 35.2},
+                {"profile_id": profile_data.id, "pressure": 100.0, "temperature": 25.8, "salinity": 35.1},
+                {"profile_id": profile_data.id, "pressure": 500.0, "temperature": 15.2, "salinity": 34.8}
+            ]
+        )).all()
+        
+        # Release the session's savepoint so the rows live until the module transaction ends
+        await session.commit()
     
     return {
         "float": float_data,
@@ -167,43 +252,66 @@ async def sample_float_data(test_db_session: AsyncSession):
     }
 
 
-@pytest.fixture
-def mock_gemini_service():
-    """Mock Gemini AI service for testing."""
-    mock_service = AsyncMock()
-    mock_service.generate_response.return_value = {
+async def _fake_generate_response(*args, **kwargs):
+    """Canned Gemini response."""
+    return {
         "message": "This is a mock AI response for testing.",
         "confidence": 0.95,
         "processing_time": 1.2,
         "metadata": {"model": "gemini-pro", "tokens_used": 150}
     }
-    return mock_service
 
 
-@pytest.fixture
-def mock_voice_service():
-    """Mock voice processing service for testing."""
-    mock_service = MagicMock()
-    mock_service.transcribe.return_value = ("This is a mock transcription.", 0.92)
-    mock_service.synthesize.return_value = b"mock_audio_data"
-    mock_service.audio_dependencies_available = True
-    return mock_service
+def _fake_transcribe(*args, **kwargs):
+    """Canned voice transcription."""
+    return ("This is a mock transcription.", 0.92)
 
 
-@pytest.fixture
-def mock_translation_service():
-    """Mock translation service for testing."""
-    mock_service = AsyncMock()
-    mock_service.detect_language.return_value = {
+def _fake_synthesize(*args, **kwargs):
+    """Canned speech synthesis output."""
+    return b"mock_audio_data"
+
+
+async def _fake_detect_language(*args, **kwargs):
+    """Canned language detection result."""
+    return {
         "detected_language": "en",
         "confidence": 0.95,
         "supported": True
     }
-    mock_service.translate.return_value = "This is a mock translation."
-    return mock_service
+
+
+async def _fake_translate(*args, **kwargs):
+    """Canned translation."""
+    return "This is a mock translation."
+
+
+@pytest.fixture
+def mock_gemini_service():
+    """Fake Gemini AI service for testing."""
+    return SimpleNamespace(generate_response=_fake_generate_response)
+
+
+@pytest.fixture
+def mock_voice_service():
+    """Fake voice processing service for testing."""
+    return SimpleNamespace(
+        transcribe=_fake_transcribe,
+        synthesize=_fake_synthesize,
+        audio_dependencies_available=True
+    )
 
 
 @pytest.fixture
+def mock_translation_service():
+    """Fake translation service for testing."""
+    return SimpleNamespace(
+        detect_language=_fake_detect_language,
+        translate=_fake_translate
+    )
+
+
+@pytest.fixture(scope="session")
 def sample_chat_message():
     """Sample chat message for testing."""
     return {
@@ -215,7 +323,20 @@ def sample_chat_message():
     }
 
 
-@pytest.fixture
+@pytest.fixture(scope="module")
+def chat_query_payload():
+    """Factory for chat query payloads; each call returns a fresh dict the test may mutate."""
+    def _build(message: str, conversation_id: str, language: str = "en") -> Dict[str, str]:
+        return {
+            "message": message,
+            "conversation_id": conversation_id,
+            "language": language
+        }
+    
+    return _build
+
+
+@pytest.fixture(scope="session")
 def sample_voice_message():
     """Sample voice message for testing."""
     return {
@@ -225,7 +346,7 @@ def sample_voice_message():
     }
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def sample_float_query():
     """Sample float query for testing."""
     return {
@@ -242,10 +363,22 @@ def sample_float_query():
     }
 
 
-@pytest.fixture
-def websocket_test_client(test_app):
-    """Create WebSocket test client."""
-    return TestClient(test_app)
+@pytest.fixture(scope="session")
+def sample_chat_message_bytes(sample_chat_message) -> bytes:
+    """Sample chat message serialized once for the session."""
+    return _json_dumps(sample_chat_message)
+
+
+@pytest.fixture(scope="session")
+def sample_voice_message_bytes(sample_voice_message) -> bytes:
+    """Sample voice message serialized once for the session."""
+    return _json_dumps(sample_voice_message)
+
+
+@pytest.fixture(scope="session")
+def sample_float_query_bytes(sample_float_query) -> bytes:
+    """Sample float query serialized once for the session."""
+    return _json_dumps(sample_float_query)
 
 
 class MockWebSocket:
@@ -285,13 +418,24 @@ def mock_websocket():
     return MockWebSocket()
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def test_settings():
-    """Get test settings."""
-    settings = get_settings()
-    settings.environment = "testing"
-    settings.database_url = TEST_DATABASE_URL
-    return settings
+    """Get test settings as a copy, leaving the cached application settings untouched."""
+    get_settings.cache_clear()
+    return get_settings().model_copy(update={
+        "environment": "testing",
+        "database_url": TEST_DATABASE_URL
+    })
+
+
+@pytest.fixture(scope="session", autouse=True)
+def _use_test_settings(test_settings):
+    """Serve the test settings from get_settings in every imported app module."""
+    with pytest.MonkeyPatch.context() as mp:
+        for name, module in list(sys.modules.items()):
+            if name.split(".", 1)[0] == "app" and getattr(module, "get_settings", None) is get_settings:
+                mp.setattr(module, "get_settings", lambda: test_settings)
+        yield
 
 
 # Utility functions for testing
@@ -300,35 +444,44 @@ def assert_valid_response(response, expected_status: int = 200):
     assert response.status_code == expected_status, f"Expected {expected_status}, got {response.status_code}: {response.text}"
     
     if response.headers.get("content-type", "").startswith("application/json"):
-        return response.json()
+        return _json_loads(response.content)
     return response.text
 
 
+_FLOAT_REQUIRED = frozenset(("id", "wmo_id", "platform_type", "status"))
+_FLOAT_STATUSES = frozenset(("active", "inactive", "recent"))
+_PROFILE_REQUIRED = frozenset(("id", "cycle_number", "profile_date", "direction"))
+_PROFILE_DIRECTIONS = frozenset(("A", "D"))
+_CHAT_REQUIRED = frozenset(("message", "timestamp"))
+_DASHBOARD_REQUIRED = frozenset((
+    "floats_count", "profiles_count", "queries_today",
+    "system_status", "last_updated"
+))
+_SYSTEM_STATUSES = frozenset(("healthy", "warning", "error"))
+
+
 def assert_valid_float_data(float_data: dict):
     """Assert that float data structure is valid."""
-    required_fields = ["id", "wmo_id", "platform_type", "status"]
-    for field in required_fields:
-        assert field in float_data, f"Missing required field: {field}"
+    missing = _FLOAT_REQUIRED - float_data.keys()
+    assert not missing, f"Missing required fields: {sorted(missing)}"
     
     assert isinstance(float_data["wmo_id"], int)
-    assert float_data["status"] in ["active", "inactive", "recent"]
+    assert float_data["status"] in _FLOAT_STATUSES
 
 
 def assert_valid_profile_data(profile_data: dict):
     """Assert that profile data structure is valid."""
-    required_fields = ["id", "cycle_number", "profile_date", "direction"]
-    for field in required_fields:
-        assert field in profile_data, f"Missing required field: {field}"
+    missing = _PROFILE_REQUIRED - profile_data.keys()
+    assert not missing, f"Missing required fields: {sorted(missing)}"
     
     assert isinstance(profile_data["cycle_number"], int)
-    assert profile_data["direction"] in ["A", "D"]
+    assert profile_data["direction"] in _PROFILE_DIRECTIONS
 
 
 def assert_valid_chat_response(response: dict):
     """Assert that chat response structure is valid."""
-    required_fields = ["message", "timestamp"]
-    for field in required_fields:
-        assert field in response, f"Missing required field: {field}"
+    missing = _CHAT_REQUIRED - response.keys()
+    assert not missing, f"Missing required fields: {sorted(missing)}"
     
     assert isinstance(response["message"], str)
     assert len(response["message"]) > 0
@@ -336,77 +489,81 @@ def assert_valid_chat_response(response: dict):
 
 def assert_valid_dashboard_stats(stats: dict):
     """Assert that dashboard statistics structure is valid."""
-    required_fields = [
-        "floats_count", "profiles_count", "queries_today", 
-        "system_status", "last_updated"
-    ]
-    for field in required_fields:
-        assert field in stats, f"Missing required field: {field}"
+    missing = _DASHBOARD_REQUIRED - stats.keys()
+    assert not missing, f"Missing required fields: {sorted(missing)}"
     
     assert isinstance(stats["floats_count"], int)
     assert isinstance(stats["profiles_count"], int)
-    assert stats["system_status"] in ["healthy", "warning", "error"]
+    assert stats["system_status"] in _SYSTEM_STATUSES
 
 
 # Async test utilities
 async def create_test_data(session: AsyncSession, count: int = 5):
     """Create test data for performance testing."""
-    floats = []
-    for i in range(count):
-        float_data = ArgoFloat(
-            wmo_id=2901000 + i,
-            platform_type="APEX",
-            status="active",
-            data_center="TEST",
-            project_name="Test Project"
-        )
-        session.add(float_data)
-        floats.append(float_data)
+    rows = [
+        {
+            "wmo_id": 2901000 + i,
+            "platform_type": "APEX",
+            "status": "active",
+            "data_center": "TEST",
+            "project_name": "Test Project"
+        }
+        for i in range(count)
+    ]
     
+    floats = (await session.scalars(insert(ArgoFloat).returning(ArgoFloat), rows)).all()
     await session.commit()
     return floats
 
 
 # Performance testing utilities
+class Timer:
+    """Monotonic nanosecond timer used as a context manager."""
+    
+    __slots__ = ("_t0", "_t1")
+    
+    def __init__(self):
+        self._t0 = None
+        self._t1 = None
+    
+    def __enter__(self):
+        self._t0 = time.perf_counter_ns()
+        return self
+    
+    def __exit__(self, *exc_info):
+        self._t1 = time.perf_counter_ns()
+    
+    @property
+    def elapsed_s(self) -> float:
+        """Elapsed time in seconds."""
+        return (self._t1 - self._t0) / 1e9
+
+
 @pytest.fixture
 def performance_timer():
     """Timer fixture for performance testing."""
-    import time
-    
-    class Timer:
-        def __init__(self):
-            self.start_time = None
-            self.end_time = None
-        
-        def start(self):
-            self.start_time = time.time()
-        
-        def stop(self):
-            self.end_time = time.time()
-            return self.elapsed()
-        
-        def elapsed(self):
-            if self.start_time and self.end_time:
-                return self.end_time - self.start_time
-            return None
-    
     return Timer()
 
 
 # Parametrized test data
-@pytest.fixture(params=["en", "hi", "bn", "te", "ta"])
+_LANGUAGES = tuple(sys.intern(s) for s in ("en", "hi", "bn", "te", "ta"))
+_MEASUREMENT_PARAMETERS = tuple(sys.intern(s) for s in ("temperature", "salinity", "pressure"))
+_PLATFORMS = tuple(sys.intern(s) for s in ("APEX", "SOLO", "PROVOR", "NAVIS_BGC"))
+
+
+@pytest.fixture(params=_LANGUAGES, ids=_LANGUAGES)
 def language_code(request):
     """Parametrized language codes for multilingual testing."""
     return request.param
 
 
-@pytest.fixture(params=["temperature", "salinity", "pressure"])
+@pytest.fixture(params=_MEASUREMENT_PARAMETERS, ids=_MEASUREMENT_PARAMETERS)
 def measurement_parameter(request):
     """Parametrized measurement parameters for testing."""
     return request.param
 
 
-@pytest.fixture(params=["APEX", "SOLO", "PROVOR", "NAVIS_BGC"])
+@pytest.fixture(params=_PLATFORMS, ids=_PLATFORMS)
 def platform_type(request):
     """Parametrized platform types for testing."""
     return request.param